@@ -5,20 +5,23 @@ A super simple FastAPI application that allows students to view and sign up
 for extracurricular activities at Mergington High School.
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import RedirectResponse
-import os
+from fastapi.responses import RedirectResponse, Response
+from email_validator import EmailNotValidError, validate_email as _check_email
+from functools import lru_cache
+import hashlib
+import orjson
 from pathlib import Path
-import re
+import sys
+from typing import Annotated
 
 app = FastAPI(title="Mergington High School API",
               description="API for viewing and signing up for extracurricular activities")
 
 # Mount the static files directory
 current_dir = Path(__file__).parent
-app.mount("/static", StaticFiles(directory=os.path.join(Path(__file__).parent,
-          "static")), name="static")
+app.mount("/static", StaticFiles(directory=current_dir / "static"), name="static")
 
 # In-memory activity database
 activities = {
@@ -78,75 +81,152 @@ activities = {
     }
 }
 
-# Email validation pattern (RFC 5321 compliant)
-# Allows standard email formats including plus signs for aliasing
-EMAIL_PATTERN = re.compile(
-    r'^[a-zA-Z0-9]+([._+-][a-zA-Z0-9]+)*@[a-zA-Z0-9]+([.-][a-zA-Z0-9]+)*\.[a-zA-Z]{2,}$'
-)
+# Intern the activity names so repeated lookups hit CPython's pointer-equality
+# fast path instead of comparing the multi-word strings byte by byte
+activities = {sys.intern(name): activity for name, activity in activities.items()}
+
+# Parallel set index so membership checks on the signup/unregister hot path
+# are O(1) instead of scanning the participants list. Kept in lockstep with
+# the list, which remains the canonical (and serialized) representation.
+for _activity in activities.values():
+    _activity["participants_set"] = set(_activity["participants"])
+    # Remaining-capacity counter so the signup capacity check is a single
+    # integer compare; kept in step with the participants list
+    _activity["remaining"] = _activity["max_participants"] - len(_activity["participants"])
+
+# Per-activity metadata (description/schedule/max_participants) never mutates
+# after import; split it out once so GET /activities only has to lay the live
+# participants lists over the frozen metadata instead of re-walking full dicts
+_ACTIVITY_META = {
+    name: {
+        k: v for k, v in activity.items()
+        if k not in ("participants", "participants_set", "remaining")
+    }
+    for name, activity in activities.items()
+}
 
+# Cached GET /activities body and its ETag, rebuilt lazily on first read after
+# a roster mutation (dirty-bit pattern): steady-state reads skip serialization
+# entirely and matching If-None-Match requests skip the body too
+_activities_json: bytes | None = None
+_activities_etag: str | None = None
 
+# Memoized: the same addresses recur across signup/unregister calls, and the
+# function is pure, so repeat validations collapse into a dict lookup
+@lru_cache(maxsize=4096)
 def validate_email(email: str) -> bool:
-    """Validate email format"""
-    if not email or len(email) > 254:  # RFC 5321
+    """Validate email format via email-validator (no deliverability DNS lookup)"""
+    try:
+        _check_email(email, check_deliverability=False)
+    except EmailNotValidError:
         return False
-    return EMAIL_PATTERN.match(email) is not None
+    return True
+
+
+def validate_emails_batch(emails: list[str]) -> list[bool]:
+    """Validate a batch of emails, e.g. for a future admin bulk-import path.
+
+    Duplicate addresses across the batch cost a single parse thanks to the
+    lru_cache on validate_email.
+    """
+    return [validate_email(email) for email in emails]
 
 
 @app.get("/")
-def root():
+async def root():
     return RedirectResponse(url="/static/index.html")
 
 
 @app.get("/activities")
-def get_activities():
-    return activities
-
-
-@app.post("/activities/{activity_name}/signup")
-def signup_for_activity(activity_name: str, email: str):
-    """Sign up a student for an activity"""
+async def get_activities(request: Request):
+    global _activities_json, _activities_etag
+    if _activities_json is None:
+        # Serialize with orjson directly: static metadata comes from the
+        # precomputed split, only the participants lists are read live
+        _activities_json = orjson.dumps({
+            name: {**_ACTIVITY_META[name], "participants": activity["participants"]}
+            for name, activity in activities.items()
+        })
+        _activities_etag = f'"{hashlib.blake2b(_activities_json, digest_size=8).hexdigest()}"'
+
+    # Content-hash conditional GET: unchanged state costs no body bytes
+    if request.headers.get("if-none-match") == _activities_etag:
+        return Response(status_code=304, headers={"ETag": _activities_etag})
+    return Response(
+        content=_activities_json,
+        media_type="application/json",
+        headers={"ETag": _activities_etag, "Cache-Control": "no-cache"},
+    )
+
+
+async def get_activity(
+    activity_name: str, email: Annotated[str, Query()]
+) -> tuple[dict, str]:
+    """Shared signup/unregister preamble: validate the email, resolve the activity"""
     # Validate email format
     if not validate_email(email):
         raise HTTPException(status_code=400, detail="Invalid email format")
-    
+
+    # Interned to match the activities keys (pointer-equality dict probe)
+    activity_name = sys.intern(activity_name)
+
     # Validate activity exists
     if activity_name not in activities:
         raise HTTPException(status_code=404, detail="Activity not found")
 
-    # Get the specific activity
-    activity = activities[activity_name]
+    return activities[activity_name], email
+
+
+@app.post("/activities/{activity_name}/signup")
+async def signup_for_activity(
+    activity_name: str,
+    resolved: Annotated[tuple[dict, str], Depends(get_activity)],
+) -> dict[str, str]:
+    """Sign up a student for an activity"""
+    global _activities_json
+    activity, email = resolved
 
     # Check if activity is at capacity
-    if len(activity["participants"]) >= activity["max_participants"]:
+    if activity["remaining"] <= 0:
         raise HTTPException(status_code=400, detail="Activity is at maximum capacity")
 
     # Validate student is not already signed up
-    if email in activity["participants"]:
+    if email in activity["participants_set"]:
         raise HTTPException(status_code=400, detail="Student is already signed up")
 
     # Add student
     activity["participants"].append(email)
+    activity["participants_set"].add(email)
+    activity["remaining"] -= 1
+    _activities_json = None
     return {"message": f"Signed up {email} for {activity_name}"}
 
 
 @app.delete("/activities/{activity_name}/signup")
-def unregister_from_activity(activity_name: str, email: str):
+async def unregister_from_activity(
+    activity_name: str,
+    resolved: Annotated[tuple[dict, str], Depends(get_activity)],
+) -> dict[str, str]:
     """Unregister a student from an activity"""
-    # Validate email format
-    if not validate_email(email):
-        raise HTTPException(status_code=400, detail="Invalid email format")
-    
-    # Validate activity exists
-    if activity_name not in activities:
-        raise HTTPException(status_code=404, detail="Activity not found")
-
-    # Get the specific activity
-    activity = activities[activity_name]
+    global _activities_json
+    activity, email = resolved
 
     # Validate student is signed up
-    if email not in activity["participants"]:
+    if email not in activity["participants_set"]:
         raise HTTPException(status_code=400, detail="Student is not signed up for this activity")
 
     # Remove student
     activity["participants"].remove(email)
+    activity["participants_set"].discard(email)
+    activity["remaining"] += 1
+    _activities_json = None
     return {"message": f"Unregistered {email} from {activity_name}"}
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # uvloop and httptools replace the default asyncio loop and h11 parser
+    # with C implementations. activities lives in process memory, so keep a
+    # single worker; scaling workers needs the state moved to a shared store.
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop", http="httptools")
@@ -4,6 +4,7 @@ from urllib.parse import quote
 import pytest
 from fastapi.testclient import TestClient
 
+import src.app
 from src.app import app, activities
 
 
@@ -18,6 +19,8 @@ def reset_activities_state():
     finally:
         activities.clear()
         activities.update(original)
+        # Drop the cached /activities body so the restored state is re-serialized
+        src.app._activities_json = None
 
 
 def test_get_activities():
@@ -29,6 +32,22 @@ def test_get_activities():
     assert "participants" in payload["Soccer Team"]
 
 
+def test_get_activities_conditional_etag():
+    """Test that If-None-Match returns 304 until the state changes"""
+    first = client.get("/activities")
+    etag = first.headers["ETag"]
+
+    cached = client.get("/activities", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    client.post("/activities/Soccer%20Team/signup?email=etag@mergington.edu")
+
+    refreshed = client.get("/activities", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["ETag"] != etag
+
+
 def test_signup_adds_participant():
     email = "newstudent@mergington.edu"
     response = client.post(